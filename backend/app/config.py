@@ -24,6 +24,9 @@ class Settings(BaseSettings):
     # API Base URL for MCP
     api_base_url: str = "https://api.allcontext.dev"
 
+    # Server-side secret for HMAC API key hashing (falls back to bcrypt if unset)
+    api_key_pepper: Optional[str] = None
+
     @property
     def port(self) -> int:
         """Get port from environment (Heroku) or use api_port."""
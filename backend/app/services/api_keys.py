@@ -1,13 +1,15 @@
 """Service layer for API key operations."""
 
+import hmac
 import secrets
 import bcrypt
 import hashlib
-from typing import List, Optional
+from typing import Callable, List, Optional
 from uuid import UUID
 from datetime import datetime, timezone
 from supabase import Client
 import logging
+from app.config import settings
 from app.database import db
 
 from app.models.api_key import (
@@ -22,6 +24,26 @@ from app.models.api_key import (
 logger = logging.getLogger(__name__)
 
 
+# Prefix marking key hashes produced by HMAC-SHA256 (bcrypt hashes start with "$2b$")
+HMAC_HASH_PREFIX = "hmac$"
+
+
+def _bcrypt_hash(data: bytes) -> str:
+    """Hash data with bcrypt for storage."""
+    return bcrypt.hashpw(data, bcrypt.gensalt()).decode()
+
+
+def _hmac_hash(data: bytes) -> str:
+    """
+    Hash data with HMAC-SHA256 keyed by the server-side pepper.
+    
+    API keys carry ~192 bits of entropy, so bcrypt's work factor adds cost
+    without adding security; a keyed HMAC is enough and takes microseconds.
+    """
+    digest = hmac.new(settings.api_key_pepper.encode(), data, hashlib.sha256).hexdigest()
+    return f"{HMAC_HASH_PREFIX}{digest}"
+
+
 class ApiKeyService:
     """Service class for API key operations."""
     
@@ -29,6 +51,19 @@ class ApiKeyService:
     KEY_PREFIX = "sk_prod_"
     KEY_LENGTH = 32  # Random part length
     MAX_KEYS_PER_USER = 10
+    MAX_LOOKUP_CANDIDATES = 5  # Caps hash comparisons per validation
+    
+    def __init__(self, hasher: Optional[Callable[[bytes], str]] = None):
+        """
+        Initialize the service.
+        
+        Args:
+            hasher: Function producing the stored key hash
+                (HMAC if API_KEY_PEPPER is set, bcrypt otherwise)
+        """
+        if hasher is None:
+            hasher = _hmac_hash if settings.api_key_pepper else _bcrypt_hash
+        self._hasher = hasher
     
     @property
     def client(self) -> Client:
@@ -49,17 +84,42 @@ class ApiKeyService:
         full_key = f"{self.KEY_PREFIX}{random_part}"
         
         # Hash the key for storage
-        key_hash = bcrypt.hashpw(full_key.encode(), bcrypt.gensalt()).decode()
+        key_hash = self._hasher(full_key.encode())
         
         # Create a lookup hash from the first 16 characters for faster filtering
         # This significantly reduces the number of bcrypt comparisons needed
-        lookup_hash = hashlib.sha256(full_key[:16].encode()).hexdigest()[:16]
+        lookup_hash = hashlib.blake2b(full_key[:16].encode(), digest_size=8).hexdigest()
         
         # Extract last 4 characters
         last_4 = random_part[-4:]
         
         return full_key, key_hash, self.KEY_PREFIX, last_4, lookup_hash
     
+    @classmethod
+    def _check_format(cls, api_key: str) -> Optional[str]:
+        """
+        Check the API key format without any I/O.
+        
+        Returns:
+            Error message if the format is invalid, None otherwise
+        """
+        if api_key.startswith(cls.KEY_PREFIX) and len(api_key) == len(cls.KEY_PREFIX) + cls.KEY_LENGTH:
+            return None
+        return "Invalid key format"
+    
+    def _verify_key_hash(self, api_key: str, key_hash: str) -> bool:
+        """
+        Check an API key against its stored hash.
+        
+        Dispatches on the hash prefix: HMAC for new keys, bcrypt for legacy rows.
+        """
+        if key_hash.startswith(HMAC_HASH_PREFIX):
+            if not settings.api_key_pepper:
+                return False
+            return hmac.compare_digest(_hmac_hash(api_key.encode()), key_hash)
+        
+        return bcrypt.checkpw(api_key.encode(), key_hash.encode())
+    
     async def create(self, user_id: UUID, data: ApiKeyCreate) -> ApiKeyCreated:
         """Create a new API key."""
         try:
@@ -198,7 +258,7 @@ class ApiKeyService:
         """
         Validate an API key and return user information.
         
-        Optimized version that uses lookup_hash to reduce bcrypt comparisons.
+        Optimized version that uses lookup_hash to reduce hash comparisons.
         
         Args:
             api_key: The API key to validate
@@ -208,31 +268,36 @@ class ApiKeyService:
         """
         try:
             # Check key format
-            if not api_key.startswith(self.KEY_PREFIX):
+            format_error = self._check_format(api_key)
+            if format_error:
                 return ApiKeyValidation(
                     is_valid=False,
-                    error_message="Invalid key format"
+                    error_message=format_error
                 )
             
             # Generate lookup hash from the provided key
-            lookup_hash = hashlib.sha256(api_key[:16].encode()).hexdigest()[:16]
+            lookup_hash = hashlib.blake2b(api_key[:16].encode(), digest_size=8).hexdigest()
+            # Keys created before the switch to BLAKE2b store a truncated SHA-256
+            legacy_lookup_hash = hashlib.sha256(api_key[:16].encode()).digest()[:8].hex()
             
             # Query only keys with matching lookup hash (much smaller set)
             response = self.client.table("api_keys") \
-                .select("*") \
+                .select("id, user_id, key_hash, scopes, expires_at") \
                 .eq("is_active", True) \
-                .eq("lookup_hash", lookup_hash) \
+                .in_("lookup_hash", [lookup_hash, legacy_lookup_hash]) \
+                .limit(self.MAX_LOOKUP_CANDIDATES) \
                 .execute()
             
+            # Unknown key: return before paying for any hash comparison
             if not response.data:
                 return ApiKeyValidation(
                     is_valid=False,
                     error_message="Invalid API key"
                 )
             
-            # Now check the bcrypt hash (on a much smaller set of keys)
+            # Now check the stored hash (on a much smaller set of keys)
             for key_record in response.data:
-                if bcrypt.checkpw(api_key.encode(), key_record['key_hash'].encode()):
+                if self._verify_key_hash(api_key, key_record['key_hash']):
                     # Check if expired
                     if key_record.get('expires_at'):
                         expires_at = datetime.fromisoformat(key_record['expires_at'])
@@ -8,7 +8,7 @@ from app.models.artifacts import (
     Artifact, ArtifactCreate, ArtifactUpdate, ArtifactSearchResult,
     ArtifactVersion, ArtifactVersionSummary, ArtifactVersionsResponse
 )
-from app.utils import extract_title_from_content, generate_snippet
+from app.utils import extract_title_from_content, generate_snippet, content_hash
 from app.database import db
 
 
@@ -31,6 +31,7 @@ class ArtifactService:
             "user_id": str(user_id),
             "title": title,
             "content": data.content,
+            "content_hash": content_hash(data.content),
             "metadata": data.metadata,
         }
         
@@ -100,6 +101,7 @@ class ArtifactService:
             update_data["title"] = data.title
         if data.content is not None:
             update_data["content"] = data.content
+            update_data["content_hash"] = content_hash(data.content)
             # Auto-generate title from new content if title not explicitly provided
             if data.title is None:
                 update_data["title"] = extract_title_from_content(data.content)
@@ -180,22 +182,27 @@ class ArtifactService:
         return response.count if response.count else 0
 
     async def get_versions(self, artifact_id: UUID, user_id: UUID) -> Optional[ArtifactVersionsResponse]:
-        """Get artifact with version history summary."""
-        response = self.client.table("artifacts") \
-            .select("id, version, version_count, version_history, title") \
-            .eq("id", str(artifact_id)) \
-            .eq("user_id", str(user_id)) \
-            .execute()
+        """
+        Get artifact with version history summary.
+
+        Summaries are built in Postgres (artifact_version_summaries), which
+        applies the limit and strips version content before sending.
+        """
+        response = self.client.rpc("artifact_version_summaries", {
+            "p_artifact": str(artifact_id),
+            "p_user": str(user_id),
+            "p_limit": 10  # Return last 10 for API
+        }).execute()
 
         if not response.data:
             return None
 
-        artifact = response.data[0]
+        artifact = response.data
 
         # Parse version history and create summaries
         versions = []
-        if artifact.get("version_history"):
-            for v in artifact["version_history"][:10]:  # Return last 10 for API
+        if artifact.get("versions"):
+            for v in artifact["versions"]:
                 changes = []
                 if v.get("title_changed"):
                     changes.append("title")
@@ -358,6 +365,7 @@ class ArtifactService:
         update_data = {
             "title": version.title,
             "content": version.content,
+            "content_hash": content_hash(version.content),
             "metadata": version.metadata
         }
 
@@ -372,22 +380,20 @@ class ArtifactService:
         return None
 
     async def get_version_diff(self, artifact_id: UUID, user_id: UUID, from_version: int, to_version: int) -> Optional[Dict[str, Any]]:
-        """Get differences between two versions."""
-        from_v = await self.get_version(artifact_id, user_id, from_version)
-        to_v = await self.get_version(artifact_id, user_id, to_version)
-
-        if not from_v or not to_v:
-            return None
+        """
+        Get differences between two versions.
 
-        return {
-            "from_version": from_version,
-            "to_version": to_version,
-            "title_changed": from_v.title != to_v.title,
-            "old_title": from_v.title if from_v.title != to_v.title else None,
-            "new_title": to_v.title if from_v.title != to_v.title else None,
-            "content_length_change": to_v.content_length - from_v.content_length,
-            "metadata_changed": from_v.metadata != to_v.metadata
-        }
+        Computed in Postgres (artifact_version_diff) so only the delta is
+        transferred, not the content of both versions.
+        """
+        response = self.client.rpc("artifact_version_diff", {
+            "p_artifact": str(artifact_id),
+            "p_user": str(user_id),
+            "p_from": from_version,
+            "p_to": to_version
+        }).execute()
+
+        return response.data or None
 
 
 # Create service instance
@@ -3,6 +3,7 @@
 from .markdown import extract_title_from_content
 from .text import (
     generate_snippet,
+    content_hash,
     find_and_replace,
     insert_at_line,
     validate_unique_match
@@ -11,6 +12,7 @@ from .text import (
 __all__ = [
     'extract_title_from_content',
     'generate_snippet',
+    'content_hash',
     'find_and_replace',
     'insert_at_line',
     'validate_unique_match'
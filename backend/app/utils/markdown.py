@@ -2,6 +2,10 @@
 
 import re
 
+# Heading patterns, compiled once at import
+_H1_RE = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+_H2_RE = re.compile(r'^##\s+(.+)$', re.MULTILINE)
+
 
 def extract_title_from_content(content: str, max_length: int = 200) -> str:
     """
@@ -27,13 +31,13 @@ def extract_title_from_content(content: str, max_length: int = 200) -> str:
     content = content.strip()
     
     # 1. Try to find first # heading
-    h1_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
+    h1_match = _H1_RE.search(content)
     if h1_match:
         title = h1_match.group(1).strip()
         return title[:max_length] if len(title) > max_length else title
     
     # 2. Try to find first ## heading
-    h2_match = re.search(r'^##\s+(.+)$', content, re.MULTILINE)
+    h2_match = _H2_RE.search(content)
     if h2_match:
         title = h2_match.group(1).strip()
         return title[:max_length] if len(title) > max_length else title
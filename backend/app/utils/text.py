@@ -1,5 +1,6 @@
 """Text processing utility functions."""
 
+import hashlib
 from typing import Optional, Tuple
 
 
@@ -26,6 +27,20 @@ def generate_snippet(content: str, max_length: int = 200) -> str:
     return content[:max_length] + "..."
 
 
+def content_hash(content: str) -> int:
+    """
+    Compute a 64-bit fingerprint of content for cheap change detection.
+
+    Args:
+        content: Text content to fingerprint
+
+    Returns:
+        Signed 64-bit integer (fits a Postgres BIGINT column)
+    """
+    digest = hashlib.blake2b(content.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
 def find_and_replace(
     content: str,
     old_string: str,
@@ -102,6 +117,38 @@ def insert_at_line(content: str, line_number: int, text: str) -> str:
     return '\n'.join(lines)
 
 
+class _AmbiguousMatchError(ValueError):
+    """ValueError for a non-unique match; the line context is built only when rendered."""
+
+    def __init__(self, content: str, old_string: str, occurrences: int):
+        # Keep the (possibly 100k-char) content out of args, repr and pickles
+        super().__init__(f"String appears {occurrences} times")
+        self.content = content
+        self.old_string = old_string
+        self.occurrences = occurrences
+
+    def __reduce__(self):
+        # Pickle as a plain ValueError carrying the rendered message
+        return ValueError, (str(self),)
+
+    def __str__(self) -> str:
+        # Try to provide context for disambiguation
+        lines = self.content.split('\n')
+        matching_lines = []
+        for i, line in enumerate(lines, 1):
+            if self.old_string in line:
+                matching_lines.append(f"Line {i}: {line.strip()[:80]}...")
+                if len(matching_lines) >= 3:
+                    matching_lines.append(f"... and {self.occurrences - 3} more")
+                    break
+
+        context = '\n'.join(matching_lines)
+        return (
+            f"String appears {self.occurrences} times. Please be more specific.\n"
+            f"Found in:\n{context}"
+        )
+
+
 def validate_unique_match(content: str, old_string: str, allow_multiple: bool = False) -> int:
     """
     Validate that old_string appears exactly once (or handle multiple).
@@ -126,20 +173,6 @@ def validate_unique_match(content: str, old_string: str, allow_multiple: bool =
         raise ValueError(f"String not found: '{old_string[:100]}{'...' if len(old_string) > 100 else ''}'")
 
     if occurrences > 1 and not allow_multiple:
-        # Try to provide context for disambiguation
-        lines = content.split('\n')
-        matching_lines = []
-        for i, line in enumerate(lines, 1):
-            if old_string in line:
-                matching_lines.append(f"Line {i}: {line.strip()[:80]}...")
-                if len(matching_lines) >= 3:
-                    matching_lines.append(f"... and {occurrences - 3} more")
-                    break
-
-        context = '\n'.join(matching_lines)
-        raise ValueError(
-            f"String appears {occurrences} times. Please be more specific.\n"
-            f"Found in:\n{context}"
-        )
+        raise _AmbiguousMatchError(content, old_string, occurrences)
 
     return occurrences
@@ -12,6 +12,7 @@ CREATE TABLE IF NOT EXISTS artifacts (
     user_id UUID NOT NULL,
     title TEXT NOT NULL CHECK (length(title) <= 200),
     content TEXT NOT NULL CHECK (length(content) <= 100000),
+    content_hash BIGINT,
     metadata JSONB DEFAULT '{}',
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW(),
@@ -20,6 +21,10 @@ CREATE TABLE IF NOT EXISTS artifacts (
     version_count INTEGER DEFAULT 0
 );
 
+-- Content fingerprint for change detection (added after the initial schema)
+ALTER TABLE artifacts
+ADD COLUMN IF NOT EXISTS content_hash BIGINT;
+
 -- Create indexes for performance
 CREATE INDEX idx_artifacts_user_id ON artifacts(user_id);
 CREATE INDEX idx_artifacts_created_at ON artifacts(created_at DESC);
@@ -76,9 +81,25 @@ DECLARE
     version_entry JSONB;
     history_limit INTEGER := 20;
     new_history JSONB;
+    content_changed BOOLEAN;
 BEGIN
+    -- Differing content hashes mean the content changed (O(1)); otherwise
+    -- compare the text, since a write that skips the backend (e.g. the SQL
+    -- editor) can change content without updating content_hash
+    IF OLD.content_hash IS NULL OR NEW.content_hash IS NULL
+       OR OLD.content_hash = NEW.content_hash THEN
+        content_changed := OLD.content IS DISTINCT FROM NEW.content;
+
+        -- Clear a hash left stale by such a write (NULL falls back to text)
+        IF content_changed AND NEW.content_hash IS NOT DISTINCT FROM OLD.content_hash THEN
+            NEW.content_hash := NULL;
+        END IF;
+    ELSE
+        content_changed := TRUE;
+    END IF;
+
     -- Only archive if content or title actually changed
-    IF OLD.content IS DISTINCT FROM NEW.content OR
+    IF content_changed OR
        OLD.title IS DISTINCT FROM NEW.title THEN
 
         -- Create version entry with metadata
@@ -90,7 +111,7 @@ BEGIN
             'updated_at', OLD.updated_at,
             'content_length', length(OLD.content),
             'title_changed', OLD.title IS DISTINCT FROM NEW.title,
-            'content_changed', OLD.content IS DISTINCT FROM NEW.content
+            'content_changed', content_changed
         );
 
         -- Prepend new version and limit to history_limit entries
@@ -147,6 +168,80 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Version history summaries without content (newest first, at most p_limit)
+CREATE OR REPLACE FUNCTION artifact_version_summaries(
+    p_artifact UUID,
+    p_user UUID,
+    p_limit INTEGER DEFAULT 10
+)
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'id', a.id,
+        'version', a.version,
+        'version_count', a.version_count,
+        'versions', COALESCE((
+            SELECT jsonb_agg(elem - 'content' - 'metadata' ORDER BY ord)
+            FROM jsonb_array_elements(a.version_history) WITH ORDINALITY AS h(elem, ord)
+            WHERE ord <= p_limit
+        ), '[]'::jsonb)
+    )
+    FROM artifacts a
+    WHERE a.id = p_artifact AND a.user_id = p_user;
+$$ LANGUAGE sql STABLE;
+
+-- Diff two artifact versions server-side (returns only the delta, never the content)
+CREATE OR REPLACE FUNCTION artifact_version_diff(
+    p_artifact UUID,
+    p_user UUID,
+    p_from INTEGER,
+    p_to INTEGER
+)
+RETURNS JSONB AS $$
+DECLARE
+    from_v JSONB;
+    to_v JSONB;
+    from_length INTEGER;
+    to_length INTEGER;
+BEGIN
+    -- Current version plus archived versions of the artifact
+    WITH versions AS (
+        SELECT jsonb_build_object(
+            'version', a.version,
+            'title', a.title,
+            'metadata', a.metadata,
+            'content_length', length(a.content)
+        ) AS v
+        FROM artifacts a
+        WHERE a.id = p_artifact AND a.user_id = p_user
+        UNION ALL
+        SELECT elem
+        FROM artifacts a, jsonb_array_elements(a.version_history) AS elem
+        WHERE a.id = p_artifact AND a.user_id = p_user
+    )
+    SELECT
+        (SELECT v FROM versions WHERE (v->>'version')::INTEGER = p_from LIMIT 1),
+        (SELECT v FROM versions WHERE (v->>'version')::INTEGER = p_to LIMIT 1)
+    INTO from_v, to_v;
+
+    IF from_v IS NULL OR to_v IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    from_length := COALESCE((from_v->>'content_length')::INTEGER, length(from_v->>'content'));
+    to_length := COALESCE((to_v->>'content_length')::INTEGER, length(to_v->>'content'));
+
+    RETURN jsonb_build_object(
+        'from_version', p_from,
+        'to_version', p_to,
+        'title_changed', (from_v->>'title') IS DISTINCT FROM (to_v->>'title'),
+        'old_title', CASE WHEN (from_v->>'title') IS DISTINCT FROM (to_v->>'title') THEN from_v->>'title' END,
+        'new_title', CASE WHEN (from_v->>'title') IS DISTINCT FROM (to_v->>'title') THEN to_v->>'title' END,
+        'content_length_change', to_length - from_length,
+        'metadata_changed', (from_v->'metadata') IS DISTINCT FROM (to_v->'metadata')
+    );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
 -- ============================================================================
 -- ROW LEVEL SECURITY (RLS)
 -- ============================================================================
@@ -202,13 +297,14 @@ GRANT SELECT ON api_keys TO anon;
 COMMENT ON TABLE artifacts IS 'Stores markdown-based AI context artifacts';
 COMMENT ON COLUMN artifacts.title IS 'Auto-generated from content if not provided';
 COMMENT ON COLUMN artifacts.content IS 'Markdown content, max 100k characters';
+COMMENT ON COLUMN artifacts.content_hash IS 'BLAKE2b-64 of content, set by the backend for O(1) change detection; cleared by the trigger when content changes without it';
 COMMENT ON COLUMN artifacts.metadata IS 'Flexible JSON metadata for categorization';
 COMMENT ON COLUMN artifacts.version_history IS 'JSONB array storing last 20 versions for rollback capability';
 COMMENT ON COLUMN artifacts.version_count IS 'Total number of edits made to this artifact (lifetime count)';
 
 COMMENT ON TABLE api_keys IS 'Stores API keys for programmatic access to the platform';
-COMMENT ON COLUMN api_keys.key_hash IS 'Bcrypt hash of the actual API key';
+COMMENT ON COLUMN api_keys.key_hash IS 'HMAC-SHA256 (hmac$ prefix) or legacy bcrypt hash of the actual API key';
 COMMENT ON COLUMN api_keys.key_prefix IS 'Visible prefix for key identification (e.g., sk_prod_)';
 COMMENT ON COLUMN api_keys.last_4 IS 'Last 4 characters of the key for display purposes';
-COMMENT ON COLUMN api_keys.lookup_hash IS 'SHA256 hash of first 16 chars of API key for fast filtering during validation';
+COMMENT ON COLUMN api_keys.lookup_hash IS 'BLAKE2b-64 hash (truncated SHA256 for older keys) of first 16 chars of API key for fast filtering during validation';
 COMMENT ON COLUMN api_keys.scopes IS 'Array of permissions: read, write, delete';
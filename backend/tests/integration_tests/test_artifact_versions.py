@@ -1,53 +1,113 @@
 """Integration tests for artifact versioning."""
 
-import sys
-import os
-# Add parent directory to path for direct execution
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-
-import asyncio
+import pytest
 from uuid import uuid4
 from app.services.artifacts import artifact_service
 from app.models.artifacts import ArtifactCreate, ArtifactUpdate
 
-async def test_version_history():
-    """Test version history creation and retrieval."""
-    user_id = uuid4()
 
+def _delete_created(user_id, created_ids):
+    """Delete all artifacts created by the tests in a single request."""
+    if not created_ids:
+        return
+    artifact_service.client.table("artifacts") \
+        .delete() \
+        .eq("user_id", str(user_id)) \
+        .in_("id", [str(artifact_id) for artifact_id in created_ids]) \
+        .execute()
+
+
+def _seed_versions(artifact, n):
+    """
+    Give an artifact n archived versions with a single UPDATE.
+
+    Writes the version_history the trigger would produce after n content updates
+    (newest first, capped at the 20-entry history limit). Title and content are
+    left untouched, so the trigger does not archive anything itself.
+    """
+    history = []
+    for version in range(n, max(n - 20, 0), -1):
+        content = artifact.content if version == 1 else f"Update {version - 1}"
+        history.append({
+            "version": version,
+            "title": artifact.title,
+            "content": content,
+            "metadata": artifact.metadata,
+            "updated_at": artifact.updated_at.isoformat(),
+            "content_length": len(content),
+            "title_changed": False,
+            "content_changed": True
+        })
+
+    artifact_service.client.table("artifacts") \
+        .update({"version_history": history, "version": n + 1, "version_count": n}) \
+        .eq("id", str(artifact.id)) \
+        .execute()
+
+
+@pytest.fixture(scope="module")
+def user_id():
+    """Test user ID shared by all tests in the module."""
+    return uuid4()
+
+
+@pytest.fixture(scope="module")
+def warm_client():
+    """Warm up the shared client so the first test doesn't pay the TLS handshake."""
+    artifact_service.client.table("artifacts").select("id").limit(1).execute()
+
+
+@pytest.fixture(scope="module")
+def created_ids(user_id, warm_client):
+    """Collect created artifact IDs and delete them once at module teardown."""
+    ids = []
+    yield ids
+    _delete_created(user_id, ids)
+
+
+@pytest.mark.asyncio
+async def test_version_history(user_id, created_ids):
+    """Test version history creation and retrieval."""
     print("Creating initial artifact...")
     # Create artifact
     artifact = await artifact_service.create(user_id, ArtifactCreate(
         title="Version Test",
         content="Initial content"
     ))
+    created_ids.append(artifact.id)
     print(f"Created artifact {artifact.id} with version {artifact.version}")
 
     print("\nMaking 5 updates...")
-    # Make several updates
+    # Make several updates, logging once at the end
+    log = []
     for i in range(5):
         updated = await artifact_service.update(
             artifact.id,
             user_id,
             ArtifactUpdate(content=f"Updated content version {i+1}")
         )
-        print(f"Update {i+1}: version is now {updated.version}")
+        log.append(f"Update {i+1}: version is now {updated.version}")
+    print("\n".join(log))
 
-    print("\nGetting version history...")
-    # Get version history
+    print("\nGetting version history, v1 and diff v1 -> v6...")
     versions = await artifact_service.get_versions(artifact.id, user_id)
+    version = await artifact_service.get_version(artifact.id, user_id, 1)
+    diff = await artifact_service.get_version_diff(artifact.id, user_id, 1, 6)
+
     assert versions is not None, "Should get version history"
     assert versions.version_count == 5, f"Should have 5 edits, got {versions.version_count}"
     assert len(versions.versions) == 5, f"Should have 5 versions in history, got {len(versions.versions)}"
     print(f"Version history: {versions.version_count} total edits")
     print(f"Recent versions: {[v.version for v in versions.versions]}")
 
-    print("\nGetting specific version (v1)...")
-    # Get specific version
-    version = await artifact_service.get_version(artifact.id, user_id, 1)
     assert version is not None, "Should get version 1"
     assert version.content == "Initial content", f"Version 1 should have initial content, got: {version.content}"
     print(f"Version 1 content: {version.content[:50]}...")
 
+    assert diff is not None, "Should get diff"
+    assert diff["content_length_change"] != 0, "Content length should change"
+    print(f"Diff v1 to v6: content length change = {diff['content_length_change']}")
+
     print("\nRestoring to version 1...")
     # Restore version
     restored = await artifact_service.restore_version(artifact.id, user_id, 1)
@@ -56,59 +116,37 @@ async def test_version_history():
     assert restored.version == 7, f"Should be version 7 after restore, got {restored.version}"  # Original + 5 updates + restore
     print(f"Restored to v1, new version is {restored.version}")
 
-    print("\nGetting diff between versions...")
-    # Test version diff
-    diff = await artifact_service.get_version_diff(artifact.id, user_id, 1, 6)
-    assert diff is not None, "Should get diff"
-    assert diff["content_length_change"] != 0, "Content length should change"
-    print(f"Diff v1 to v6: content length change = {diff['content_length_change']}")
-
-    print("\nCleaning up...")
-    # Cleanup
-    deleted = await artifact_service.delete(artifact.id, user_id)
-    assert deleted, "Should delete artifact"
     print("Test completed successfully!")
 
-async def test_version_limit():
-    """Test that version history is limited to 20 versions."""
-    user_id = uuid4()
-
-    print("\nTesting version history limit...")
+@pytest.mark.asyncio
+async def test_version_list_limit(user_id, created_ids):
+    """Test that the API returns at most 10 versions of a long history."""
+    print("\nTesting version list limit...")
     # Create artifact
     artifact = await artifact_service.create(user_id, ArtifactCreate(
         title="Limit Test",
         content="Initial"
     ))
+    created_ids.append(artifact.id)
 
-    # Make 25 updates to exceed the 20 version limit
-    print("Making 25 updates to test limit...")
-    for i in range(25):
-        await artifact_service.update(
-            artifact.id,
-            user_id,
-            ArtifactUpdate(content=f"Update {i+1}")
-        )
+    # Seed a 25-edit history directly; the trigger's own 20-entry cap is not
+    # exercised here (the update path is covered by test_version_history)
+    print("Seeding 25 versions...")
+    _seed_versions(artifact, 25)
 
     # Get version history
     versions = await artifact_service.get_versions(artifact.id, user_id)
     assert versions is not None, "Should get version history"
     assert versions.version_count == 25, f"Should track 25 total edits, got {versions.version_count}"
-    # Note: API returns max 10 versions, but DB stores 20
-    assert len(versions.versions) <= 10, f"API should return max 10 versions, got {len(versions.versions)}"
+    assert len(versions.versions) == 10, f"API should return 10 versions, got {len(versions.versions)}"
+    assert versions.versions[0].version == 25, "API should return the newest versions first"
     print(f"Total edits: {versions.version_count}")
     print(f"Versions returned by API: {len(versions.versions)} (max 10)")
+    print("Version list limit test completed!")
 
-    # The oldest version in history should be v6 (25 - 20 + 1)
-    # But we can't directly test this without DB access
-
-    # Cleanup
-    await artifact_service.delete(artifact.id, user_id)
-    print("Version limit test completed!")
-
-async def test_no_change_no_version():
+@pytest.mark.asyncio
+async def test_no_change_no_version(user_id, created_ids):
     """Test that version doesn't increment if content doesn't change."""
-    user_id = uuid4()
-
     print("\nTesting change detection...")
     # Create artifact
     artifact = await artifact_service.create(user_id, ArtifactCreate(
@@ -116,6 +154,7 @@ async def test_no_change_no_version():
         content="Same content",
         metadata={"key": "value"}
     ))
+    created_ids.append(artifact.id)
     initial_version = artifact.version
 
     # Update with same content (only metadata change)
@@ -129,6 +168,17 @@ async def test_no_change_no_version():
     # Version should not increment for metadata-only change
     # Actually, the trigger checks for title/content changes only
     print(f"Version after metadata update: {updated.version}")
+    assert updated.version == initial_version, "Version should not increment on metadata-only change"
+
+    # Rewrite identical content (title passed so it isn't re-derived from content)
+    print("Updating with identical content...")
+    updated = await artifact_service.update(
+        artifact.id,
+        user_id,
+        ArtifactUpdate(title="No Change Test", content="Same content")
+    )
+    print(f"Version after identical content update: {updated.version}")
+    assert updated.version == initial_version, "Version should not increment when content hash is unchanged"
 
     # Update with actual content change
     print("Updating content...")
@@ -139,31 +189,4 @@ async def test_no_change_no_version():
     )
     print(f"Version after content update: {updated.version}")
     assert updated.version > initial_version, "Version should increment on content change"
-
-    # Cleanup
-    await artifact_service.delete(artifact.id, user_id)
     print("Change detection test completed!")
-
-async def main():
-    """Run all tests."""
-    print("=" * 60)
-    print("ARTIFACT VERSIONING INTEGRATION TESTS")
-    print("=" * 60)
-
-    try:
-        await test_version_history()
-        await test_version_limit()
-        await test_no_change_no_version()
-
-        print("\n" + "=" * 60)
-        print("ALL TESTS PASSED ✅")
-        print("=" * 60)
-    except AssertionError as e:
-        print(f"\n❌ Test failed: {e}")
-        raise
-    except Exception as e:
-        print(f"\n❌ Unexpected error: {e}")
-        raise
-
-if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
@@ -12,21 +12,26 @@ from app.models.artifacts import ArtifactCreate, ArtifactUpdate
 from app.services.artifacts import ArtifactService
 
 
-@pytest.fixture
+def _mk(title, content="Content", **kwargs):
+    """Build a known-valid ArtifactCreate without re-running validation."""
+    return ArtifactCreate.model_construct(title=title, content=content, **kwargs)
+
+
+@pytest.fixture(scope="module")
 def artifact_service():
-    """Create artifact service instance."""
+    """Create artifact service instance shared across the module."""
     return ArtifactService()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def user_id():
-    """Generate a test user ID."""
+    """Generate a test user ID shared across the module."""
     return uuid4()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def other_user_id():
-    """Generate another test user ID."""
+    """Generate another test user ID shared across the module."""
     return uuid4()
 
 
@@ -40,10 +45,7 @@ class TestArtifactServiceSupabase:
 
     async def test_create_and_get_artifact(self, artifact_service, user_id):
         """Should create and retrieve artifact via Supabase."""
-        data = ArtifactCreate(
-            title="Test Artifact",
-            content="Test content for Supabase"
-        )
+        data = _mk("Test Artifact", "Test content for Supabase")
 
         # Create artifact
         created = await artifact_service.create(user_id, data)
@@ -63,24 +65,20 @@ class TestArtifactServiceSupabase:
     async def test_search_artifacts(self, artifact_service, user_id):
         """Should search artifacts in Supabase."""
         # Create test artifacts
-        artifact1 = await artifact_service.create(user_id, ArtifactCreate(
-            title="Python Guide", content="Learn Python programming"
-        ))
-        artifact2 = await artifact_service.create(user_id, ArtifactCreate(
-            title="JavaScript Tips", content="Modern JS with Python examples"
-        ))
+        artifact1 = await artifact_service.create(user_id, _mk("Python Guide", "Learn Python programming"))
+        artifact2 = await artifact_service.create(user_id, _mk("JavaScript Tips", "Modern JS with Python examples"))
 
         # Search for "Python"
         results = await artifact_service.search(user_id, "Python")
-        titles = [r.title for r in results]
+        by_title = {r.title: r for r in results}
 
-        assert "Python Guide" in titles
-        assert "JavaScript Tips" in titles  # Has Python in content
+        # JavaScript Tips matches on content
+        assert by_title.keys() == {"Python Guide", "JavaScript Tips"}
 
-        # Verify search returns snippets
-        for result in results:
-            assert hasattr(result, 'snippet')
-            assert not hasattr(result, 'content')
+        # Verify search returns snippets, not full content
+        assert by_title["Python Guide"].snippet == "Learn Python programming"
+        assert by_title["JavaScript Tips"].snippet == "Modern JS with Python examples"
+        assert not any(hasattr(r, 'content') for r in results)
 
         # Cleanup
         await artifact_service.delete(artifact1.id, user_id)
@@ -89,9 +87,7 @@ class TestArtifactServiceSupabase:
     async def test_update_artifact(self, artifact_service, user_id):
         """Should update artifact in Supabase."""
         # Create artifact
-        created = await artifact_service.create(user_id, ArtifactCreate(
-            title="Original", content="Original content"
-        ))
+        created = await artifact_service.create(user_id, _mk("Original", "Original content"))
 
         # Update it
         update = ArtifactUpdate(title="Updated", content="Updated content")
@@ -107,9 +103,7 @@ class TestArtifactServiceSupabase:
     async def test_delete_artifact(self, artifact_service, user_id):
         """Should delete artifact from Supabase."""
         # Create artifact
-        created = await artifact_service.create(user_id, ArtifactCreate(
-            title="To Delete", content="Content"
-        ))
+        created = await artifact_service.create(user_id, _mk("To Delete"))
 
         # Delete it
         deleted = await artifact_service.delete(created.id, user_id)
@@ -7,10 +7,16 @@ Before running:
 2. (Optional) Start ngrok: ngrok http 8000
 3. Set NGROK_URL in .env if using ngrok
 4. Ensure .env has OPENAI_API_KEY and ALLCONTEXT_API_KEY
+
+Tests run in sequence (see main): each request is chained to the previous
+response so OpenAI reuses the imported MCP tool list instead of calling
+mcp_list_tools against the server on every request. The search test looks
+for the artifact created by test_create_artifact, so it runs last.
 """
 
 import os
 import sys
+import functools
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -21,7 +27,7 @@ load_dotenv(backend_dir / ".env")
 # Add backend to path for imports
 sys.path.insert(0, str(backend_dir))
 
-from openai import OpenAI
+from openai import OpenAI, NOT_GIVEN
 
 # Configuration
 NGROK_URL = os.getenv("NGROK_URL", "http://localhost:8000")
@@ -37,8 +43,36 @@ if not OPENAI_KEY:
     print("Error: OPENAI_API_KEY not found in .env")
     sys.exit(1)
 
-# Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_KEY)
+@functools.lru_cache(maxsize=1)
+def get_client():
+    """Return the shared OpenAI client, created on first use rather than at import."""
+    return OpenAI(api_key=OPENAI_KEY)
+
+# MCP server configuration shared by all tests
+MCP_TOOLS = [{
+    "type": "mcp",
+    "server_label": "Allcontext",
+    "server_description": "Personal AI context management platform",
+    "server_url": MCP_URL,
+    "authorization": API_KEY,
+    "require_approval": "never"
+}]
+
+# Last response ID, used to chain requests and reuse the cached tool list
+_previous_response_id = None
+
+def create_response(input_text):
+    """Send a request to OpenAI with the MCP tools, chained to the previous response."""
+    global _previous_response_id
+
+    response = get_client().responses.create(
+        model="gpt-4o",
+        tools=MCP_TOOLS,
+        input=input_text,
+        previous_response_id=_previous_response_id or NOT_GIVEN
+    )
+    _previous_response_id = response.id
+    return response
 
 def test_list_artifacts():
     """Test listing artifacts."""
@@ -47,18 +81,7 @@ def test_list_artifacts():
     print("=" * 60)
     
     try:
-        response = client.responses.create(
-            model="gpt-4o",
-            tools=[{
-                "type": "mcp",
-                "server_label": "Allcontext",
-                "server_description": "Personal AI context management platform",
-                "server_url": MCP_URL,
-                "authorization": API_KEY,
-                "require_approval": "never"
-            }],
-            input="List my artifacts"
-        )
+        response = create_response("List my artifacts")
         
         print(f"Response: {response.output_text}")
         
@@ -92,18 +115,7 @@ def test_create_artifact():
     print("=" * 60)
     
     try:
-        response = client.responses.create(
-            model="gpt-4o",
-            tools=[{
-                "type": "mcp",
-                "server_label": "Allcontext",
-                "server_description": "Personal AI context management platform",
-                "server_url": MCP_URL,
-                "authorization": API_KEY,
-                "require_approval": "never"
-            }],
-            input="Create an artifact with the content '# Test from OpenAI\n\nThis artifact was created via OpenAI SDK.'"
-        )
+        response = create_response("Create an artifact with the content '# Test from OpenAI\n\nThis artifact was created via OpenAI SDK.'")
         
         print(f"Response: {response.output_text}")
         
@@ -130,18 +142,7 @@ def test_search_artifacts():
     print("=" * 60)
     
     try:
-        response = client.responses.create(
-            model="gpt-4o",
-            tools=[{
-                "type": "mcp",
-                "server_label": "Allcontext",
-                "server_description": "Personal AI context management platform",
-                "server_url": MCP_URL,
-                "authorization": API_KEY,
-                "require_approval": "never"
-            }],
-            input="Search for artifacts containing 'OpenAI'"
-        )
+        response = create_response("Search for artifacts containing 'OpenAI'")
         
         print(f"Response: {response.output_text}")
         
@@ -1,9 +1,11 @@
 """Unit tests for MCP server authentication and scope enforcement."""
 
+import asyncio
 import pytest
-from unittest.mock import patch, AsyncMock
+from unittest.mock import patch
 from uuid import uuid4
-from contextvars import copy_context
+from contextlib import contextmanager
+from contextvars import Context
 
 from app.mcp_server.auth import (
     authenticated_user_id,
@@ -25,134 +27,157 @@ from app.mcp_server.tools import (
 )
 from app.models.api_key import ApiKeyValidation
 
+# Opaque IDs shared across tests; none of them rely on uniqueness
+_SHARED_USER_ID = uuid4()
+_SHARED_ARTIFACT_ID = str(uuid4())
+
+# Scope fixtures shared across tests
+_ALL_SCOPES = ("read", "write", "delete")
+_OTHER_SCOPES = {
+    required: frozenset(s for s in _ALL_SCOPES if s != required)
+    for required in _ALL_SCOPES
+}
+_SCOPE_COMBOS = tuple(
+    (frozenset(user_scopes), required_scope, should_pass)
+    for user_scopes, required_scope, should_pass in [
+        (["read"], "read", True),
+        (["read"], "write", False),
+        (["read", "write"], "read", True),
+        (["read", "write"], "write", True),
+        (["read", "write"], "delete", False),
+        (["read", "write", "delete"], "delete", True),
+        ([], "read", False),
+    ]
+)
+
+
+def _scope_id(value):
+    """Readable test ID for scope sets, e.g. 'read+write' or 'none'."""
+    if isinstance(value, frozenset):
+        return "+".join(sorted(value)) or "none"
+    return None
+
+
+@contextmanager
+def _auth(user_id, scopes):
+    """Set the authentication context for the duration of the block."""
+    user_token = authenticated_user_id.set(user_id)
+    scopes_token = authenticated_scopes.set(scopes)
+    try:
+        yield
+    finally:
+        authenticated_scopes.reset(scopes_token)
+        authenticated_user_id.reset(user_token)
+
 
 class TestMCPContextManagement:
     """Test suite for MCP context variable management."""
 
-    def test_authenticated_user_id_default(self):
-        """Should have None as default value."""
-        # Create a new context to avoid interference
-        ctx = copy_context()
-        result = ctx.run(lambda: authenticated_user_id.get())
-        assert result is None
-
-    def test_authenticated_user_id_storage(self):
-        """Should store and retrieve user ID."""
-        test_user_id = uuid4()
-
-        def test_in_context():
-            authenticated_user_id.set(test_user_id)
-            return authenticated_user_id.get()
-
-        ctx = copy_context()
-        result = ctx.run(test_in_context)
-        assert result == test_user_id
-
-    def test_authenticated_scopes_default(self):
-        """Should have empty list as default value."""
-        ctx = copy_context()
-        result = ctx.run(lambda: authenticated_scopes.get())
-        assert result == []
-
-    def test_authenticated_scopes_storage(self):
-        """Should store and retrieve scopes."""
-        test_scopes = ["read", "write"]
-
-        def test_in_context():
-            authenticated_scopes.set(test_scopes)
-            return authenticated_scopes.get()
-
-        ctx = copy_context()
-        result = ctx.run(test_in_context)
-        assert result == test_scopes
-
-    def test_get_authenticated_user_id_function(self):
-        """Should retrieve user ID from context."""
-        test_user_id = uuid4()
-
-        def test_in_context():
-            authenticated_user_id.set(test_user_id)
-            return get_authenticated_user_id()
-
-        ctx = copy_context()
-        result = ctx.run(test_in_context)
-        assert result == test_user_id
-
-    def test_get_authenticated_user_id_none(self):
-        """Should return None when no user ID set."""
-        ctx = copy_context()
-        result = ctx.run(get_authenticated_user_id)
-        assert result is None
+    @pytest.mark.parametrize("getter,default", [
+        (authenticated_user_id.get, None),
+        (authenticated_scopes.get, []),
+        (get_authenticated_user_id, None),
+    ], ids=["user_id", "scopes", "get_authenticated_user_id"])
+    def test_context_defaults(self, getter, default):
+        """Should return the default value when nothing is set."""
+        # A fresh context sees only the defaults
+        assert Context().run(getter) == default
+
+    @pytest.mark.parametrize("var,value,getter", [
+        (authenticated_user_id, uuid4(), authenticated_user_id.get),
+        (authenticated_scopes, ["read", "write"], authenticated_scopes.get),
+        (authenticated_user_id, uuid4(), get_authenticated_user_id),
+    ], ids=["user_id", "scopes", "get_authenticated_user_id"])
+    def test_context_storage(self, var, value, getter):
+        """Should store and retrieve the value set in the context."""
+        token = var.set(value)
+        try:
+            assert getter() == value
+        finally:
+            var.reset(token)
 
     def test_check_required_scope_with_permission(self):
         """Should return True when user has required scope."""
-        def test_in_context():
-            authenticated_scopes.set(["read", "write"])
-            return check_required_scope("read")
-
-        ctx = copy_context()
-        result = ctx.run(test_in_context)
-        assert result is True
+        token = authenticated_scopes.set(["read", "write"])
+        try:
+            assert check_required_scope("read") is True
+        finally:
+            authenticated_scopes.reset(token)
 
     def test_check_required_scope_without_permission(self):
         """Should return False when user lacks required scope."""
-        def test_in_context():
-            authenticated_scopes.set(["read"])
-            return check_required_scope("write")
-
-        ctx = copy_context()
-        result = ctx.run(test_in_context)
-        assert result is False
+        token = authenticated_scopes.set(["read"])
+        try:
+            assert check_required_scope("write") is False
+        finally:
+            authenticated_scopes.reset(token)
 
     def test_check_required_scope_empty_scopes(self):
         """Should return False when no scopes are set."""
-        def test_in_context():
-            authenticated_scopes.set([])
-            return check_required_scope("read")
+        token = authenticated_scopes.set([])
+        try:
+            assert check_required_scope("read") is False
+        finally:
+            authenticated_scopes.reset(token)
+
+
+class _StubApiKeyService:
+    """Stand-in for api_key_service that returns a preset validation."""
 
-        ctx = copy_context()
-        result = ctx.run(test_in_context)
-        assert result is False
+    def __init__(self):
+        self.next_validation = None
+
+    def set_next(self, validation):
+        """Set the validation returned by the next validate() calls."""
+        self.next_validation = validation
+
+    async def validate(self, key):
+        return self.next_validation
 
 
 class TestApiKeyVerifier:
     """Test suite for ApiKeyVerifier class."""
 
-    @pytest.mark.asyncio
-    async def test_verify_token_valid_key(self):
-        """Should verify valid API key and set context."""
-        verifier = ApiKeyVerifier()
-        test_user_id = uuid4()
-        test_scopes = ["read", "write"]
-        test_token = "sk_prod_testkey123456789012345678901234"
-
-        # Mock the validation
-        mock_validation = ApiKeyValidation(
+    @pytest.fixture(scope="class", autouse=True)
+    def mock_api_key_service(self):
+        """Patch the API key service once for the whole class."""
+        with patch('app.services.api_keys.api_key_service', new=_StubApiKeyService()) as stub_service:
+            yield stub_service
+
+    @pytest.fixture(scope="class")
+    def verifier(self):
+        """Shared verifier instance for the class."""
+        return ApiKeyVerifier()
+
+    @pytest.fixture(scope="class")
+    def valid_validation(self):
+        """Successful validation shared by the success-path tests."""
+        return ApiKeyValidation(
             is_valid=True,
-            user_id=test_user_id,
-            scopes=test_scopes,
+            user_id=_SHARED_USER_ID,
+            scopes=["read", "write"],
             key_id=uuid4()
         )
 
-        with patch('app.services.api_keys.api_key_service') as mock_service:
-            mock_service.validate = AsyncMock(return_value=mock_validation)
+    @pytest.mark.asyncio
+    async def test_verify_token_valid_key(self, verifier, mock_api_key_service, valid_validation):
+        """Should verify valid API key and set context."""
+        test_token = "sk_prod_testkey123456789012345678901234"
 
-            def test_in_context():
-                return verifier.verify_token(test_token)
+        mock_api_key_service.set_next(valid_validation)
 
-            ctx = copy_context()
-            access_token = await ctx.run(test_in_context)
+        with _auth(None, []):
+            access_token = await verifier.verify_token(test_token)
 
-            # Verify AccessToken is returned
-            assert access_token is not None
-            assert access_token.token == test_token
-            assert access_token.scopes == test_scopes
-            assert access_token.client_id == f"user_{test_user_id}"
+        # Verify AccessToken is returned
+        assert access_token is not None
+        assert access_token.token == test_token
+        assert access_token.scopes == ["read", "write"]
+        assert access_token.client_id == f"user_{_SHARED_USER_ID}"
 
     @pytest.mark.asyncio
-    async def test_verify_token_invalid_key(self):
+    async def test_verify_token_invalid_key(self, verifier, mock_api_key_service):
         """Should return None for invalid API key and clear context."""
-        verifier = ApiKeyVerifier()
         test_token = "invalid_key"
 
         # Mock invalid validation
@@ -161,54 +186,33 @@ class TestApiKeyVerifier:
             error_message="Invalid API key"
         )
 
-        with patch('app.services.api_keys.api_key_service') as mock_service:
-            mock_service.validate = AsyncMock(return_value=mock_validation)
-
-            def test_in_context():
-                return verifier.verify_token(test_token)
+        mock_api_key_service.set_next(mock_validation)
 
-            ctx = copy_context()
-            access_token = await ctx.run(test_in_context)
+        with _auth(None, []):
+            access_token = await verifier.verify_token(test_token)
 
-            # Should return None
-            assert access_token is None
+        # Should return None
+        assert access_token is None
 
     @pytest.mark.asyncio
-    async def test_verify_token_sets_context_variables(self):
+    async def test_verify_token_sets_context_variables(self, verifier, mock_api_key_service, valid_validation):
         """Should set context variables when validation succeeds."""
-        verifier = ApiKeyVerifier()
-        test_user_id = uuid4()
         test_scopes = ["read", "delete"]
         test_token = "sk_prod_testkey123456789012345678901234"
 
-        mock_validation = ApiKeyValidation(
-            is_valid=True,
-            user_id=test_user_id,
-            scopes=test_scopes,
-            key_id=uuid4()
-        )
-
-        with patch('app.services.api_keys.api_key_service') as mock_service:
-            mock_service.validate = AsyncMock(return_value=mock_validation)
+        # Copy without re-running validators
+        mock_api_key_service.set_next(valid_validation.model_copy(update={"scopes": test_scopes}))
 
-            async def test_in_context():
-                await verifier.verify_token(test_token)
-                # Check that context variables were set
-                return {
-                    'user_id': authenticated_user_id.get(),
-                    'scopes': authenticated_scopes.get()
-                }
+        with _auth(None, []):
+            await verifier.verify_token(test_token)
 
-            ctx = copy_context()
-            result = await ctx.run(test_in_context)
-
-            assert result['user_id'] == test_user_id
-            assert result['scopes'] == test_scopes
+            # Check that context variables were set
+            assert authenticated_user_id.get() == _SHARED_USER_ID
+            assert authenticated_scopes.get() == test_scopes
 
     @pytest.mark.asyncio
-    async def test_verify_token_clears_context_on_failure(self):
+    async def test_verify_token_clears_context_on_failure(self, verifier, mock_api_key_service):
         """Should clear context variables when validation fails."""
-        verifier = ApiKeyVerifier()
         test_token = "invalid_key"
 
         mock_validation = ApiKeyValidation(
@@ -216,28 +220,15 @@ class TestApiKeyVerifier:
             error_message="Invalid API key"
         )
 
-        # Pre-set some context values
-        def setup_context():
-            authenticated_user_id.set(uuid4())
-            authenticated_scopes.set(["read"])
-
-        with patch('app.services.api_keys.api_key_service') as mock_service:
-            mock_service.validate = AsyncMock(return_value=mock_validation)
-
-            async def test_in_context():
-                setup_context()
-                await verifier.verify_token(test_token)
-                # Check that context variables were cleared
-                return {
-                    'user_id': authenticated_user_id.get(),
-                    'scopes': authenticated_scopes.get()
-                }
+        mock_api_key_service.set_next(mock_validation)
 
-            ctx = copy_context()
-            result = await ctx.run(test_in_context)
+        # Pre-set some context values
+        with _auth(_SHARED_USER_ID, ["read"]):
+            await verifier.verify_token(test_token)
 
-            assert result['user_id'] is None
-            assert result['scopes'] == []
+            # Check that context variables were cleared
+            assert authenticated_user_id.get() is None
+            assert authenticated_scopes.get() == []
 
 
 class TestScopeEnforcement:
@@ -245,144 +236,56 @@ class TestScopeEnforcement:
 
     def setup_method(self):
         """Set up common test data."""
-        self.test_user_id = uuid4()
-        self.test_artifact_id = str(uuid4())
+        self.test_user_id = _SHARED_USER_ID
+        self.test_artifact_id = _SHARED_ARTIFACT_ID
 
-    def _setup_context(self, user_id=None, scopes=None):
+    def _setup_context(self, scopes=None):
         """Helper to set up authentication context."""
-        authenticated_user_id.set(user_id if user_id is not None else self.test_user_id)
-        authenticated_scopes.set(scopes if scopes is not None else ["read", "write"])
+        return _auth(self.test_user_id, scopes if scopes is not None else ["read", "write"])
 
     def _setup_no_auth_context(self):
         """Helper to set up unauthenticated context."""
-        authenticated_user_id.set(None)
-        authenticated_scopes.set([])
-
-    # READ operations tests
-    @pytest.mark.asyncio
-    async def test_list_artifacts_requires_read_scope(self):
-        """Should require read scope for list_artifacts."""
-        async def test_in_context():
-            self._setup_context(scopes=["write"])  # No read scope
-            return await list_artifacts()
-
-        ctx = copy_context()
-        result = await ctx.run(test_in_context)
-
-        assert isinstance(result, list)
-        assert len(result) == 1
-        assert result[0]["error"] == "Insufficient permissions. Required scope: read"
-
+        return _auth(None, [])
+
+    @pytest.mark.parametrize("required_scope,tool_call", [
+        ("read", lambda artifact_id: list_artifacts()),
+        ("read", lambda artifact_id: search_artifacts("test query")),
+        ("read", lambda artifact_id: get_artifact(artifact_id)),
+        ("read", lambda artifact_id: list_artifact_versions(artifact_id)),
+        ("read", lambda artifact_id: get_artifact_version(artifact_id, 1)),
+        ("write", lambda artifact_id: create_artifact("test content")),
+        ("write", lambda artifact_id: update_artifact(artifact_id, title="new title")),
+        ("write", lambda artifact_id: restore_artifact_version(artifact_id, 1)),
+        ("delete", lambda artifact_id: delete_artifact(artifact_id)),
+    ], ids=[
+        "list_artifacts",
+        "search_artifacts",
+        "get_artifact",
+        "list_artifact_versions",
+        "get_artifact_version",
+        "create_artifact",
+        "update_artifact",
+        "restore_artifact_version",
+        "delete_artifact",
+    ])
     @pytest.mark.asyncio
-    async def test_search_artifacts_requires_read_scope(self):
-        """Should require read scope for search_artifacts."""
-        async def test_in_context():
-            self._setup_context(scopes=["write"])  # No read scope
-            return await search_artifacts("test query")
+    async def test_tool_requires_scope(self, required_scope, tool_call):
+        """Should reject tools when the required scope is missing."""
+        with self._setup_context(scopes=_OTHER_SCOPES[required_scope]):
+            result = await tool_call(self.test_artifact_id)
 
-        ctx = copy_context()
-        result = await ctx.run(test_in_context)
-
-        assert isinstance(result, list)
-        assert len(result) == 1
-        assert result[0]["error"] == "Insufficient permissions. Required scope: read"
-
-    @pytest.mark.asyncio
-    async def test_get_artifact_requires_read_scope(self):
-        """Should require read scope for get_artifact."""
-        async def test_in_context():
-            self._setup_context(scopes=["write"])  # No read scope
-            return await get_artifact(self.test_artifact_id)
-
-        ctx = copy_context()
-        result = await ctx.run(test_in_context)
-
-        assert result["error"] == "Insufficient permissions. Required scope: read"
-
-    @pytest.mark.asyncio
-    async def test_list_artifact_versions_requires_read_scope(self):
-        """Should require read scope for list_artifact_versions."""
-        async def test_in_context():
-            self._setup_context(scopes=["write"])  # No read scope
-            return await list_artifact_versions(self.test_artifact_id)
-
-        ctx = copy_context()
-        result = await ctx.run(test_in_context)
-
-        assert result["error"] == "Insufficient permissions. Required scope: read"
-
-    @pytest.mark.asyncio
-    async def test_get_artifact_version_requires_read_scope(self):
-        """Should require read scope for get_artifact_version."""
-        async def test_in_context():
-            self._setup_context(scopes=["write"])  # No read scope
-            return await get_artifact_version(self.test_artifact_id, 1)
-
-        ctx = copy_context()
-        result = await ctx.run(test_in_context)
-
-        assert result["error"] == "Insufficient permissions. Required scope: read"
-
-    # WRITE operations tests
-    @pytest.mark.asyncio
-    async def test_create_artifact_requires_write_scope(self):
-        """Should require write scope for create_artifact."""
-        async def test_in_context():
-            self._setup_context(scopes=["read"])  # No write scope
-            return await create_artifact("test content")
-
-        ctx = copy_context()
-        result = await ctx.run(test_in_context)
-
-        assert result["error"] == "Insufficient permissions. Required scope: write"
-
-    @pytest.mark.asyncio
-    async def test_update_artifact_requires_write_scope(self):
-        """Should require write scope for update_artifact."""
-        async def test_in_context():
-            self._setup_context(scopes=["read"])  # No write scope
-            return await update_artifact(self.test_artifact_id, title="new title")
-
-        ctx = copy_context()
-        result = await ctx.run(test_in_context)
-
-        assert result["error"] == "Insufficient permissions. Required scope: write"
-
-    @pytest.mark.asyncio
-    async def test_restore_artifact_version_requires_write_scope(self):
-        """Should require write scope for restore_artifact_version."""
-        async def test_in_context():
-            self._setup_context(scopes=["read"])  # No write scope
-            return await restore_artifact_version(self.test_artifact_id, 1)
-
-        ctx = copy_context()
-        result = await ctx.run(test_in_context)
-
-        assert result["error"] == "Insufficient permissions. Required scope: write"
-
-    # DELETE operations tests
-    @pytest.mark.asyncio
-    async def test_delete_artifact_requires_delete_scope(self):
-        """Should require delete scope for delete_artifact."""
-        async def test_in_context():
-            self._setup_context(scopes=["read", "write"])  # No delete scope
-            return await delete_artifact(self.test_artifact_id)
-
-        ctx = copy_context()
-        result = await ctx.run(test_in_context)
-
-        assert result["error"] == "Insufficient permissions. Required scope: delete"
+        # List tools wrap the error in a single-item list
+        if isinstance(result, list):
+            assert len(result) == 1
+            result = result[0]
+        assert result["error"] == f"Insufficient permissions. Required scope: {required_scope}"
 
     # Authentication tests
     @pytest.mark.asyncio
     async def test_unauthenticated_access_blocked(self):
         """Should block access when not authenticated."""
-        async def test_in_context():
-            self._setup_no_auth_context()
-            return await create_artifact("test content")
-
-        ctx = copy_context()
-        result = await ctx.run(test_in_context)
+        with self._setup_no_auth_context():
+            result = await create_artifact("test content")
 
         assert result["error"] == "Authentication required. Please provide a valid API key."
 
@@ -392,25 +295,19 @@ class TestMCPToolAuthorization:
 
     def setup_method(self):
         """Set up common test data."""
-        self.test_user_id = uuid4()
-        self.test_artifact_id = str(uuid4())
+        self.test_user_id = _SHARED_USER_ID
+        self.test_artifact_id = _SHARED_ARTIFACT_ID
 
     def _setup_context_with_all_scopes(self):
         """Helper to set up context with all scopes."""
-        authenticated_user_id.set(self.test_user_id)
-        authenticated_scopes.set(["read", "write", "delete"])
+        return _auth(self.test_user_id, frozenset(_ALL_SCOPES))
 
     @pytest.mark.asyncio
     async def test_tool_with_sufficient_permissions_proceeds(self):
         """Should proceed past scope check when user has required permissions."""
-        async def test_in_context():
-            self._setup_context_with_all_scopes()
+        with self._setup_context_with_all_scopes():
             # This will fail at the service level but should pass the scope check
             result = await list_artifacts(limit=5)
-            return result
-
-        ctx = copy_context()
-        result = await ctx.run(test_in_context)
 
         # Should not return a permission error - will get a different error from missing service
         assert isinstance(result, list)
@@ -427,41 +324,27 @@ class TestMCPToolAuthorization:
             ("delete", lambda: delete_artifact(self.test_artifact_id))
         ]
 
-        for required_scope, tool_func in test_cases:
-            # Test with missing scope
-            async def test_without_scope():
-                other_scopes = [s for s in ["read", "write", "delete"] if s != required_scope]
-                authenticated_user_id.set(self.test_user_id)
-                authenticated_scopes.set(other_scopes)
+        async def call_without_scope(required_scope, tool_func):
+            # Each gathered task runs in its own copy of the context
+            with _auth(self.test_user_id, _OTHER_SCOPES[required_scope]):
                 return await tool_func()
 
-            ctx = copy_context()
-            result = await ctx.run(test_without_scope)
+        results = await asyncio.gather(
+            *(call_without_scope(required_scope, tool_func) for required_scope, tool_func in test_cases)
+        )
 
+        for result in results:
             # Should be blocked
             if isinstance(result, list):
                 assert any("Insufficient permissions" in str(item) for item in result)
             else:
                 assert "Insufficient permissions" in str(result)
 
-    def test_scope_combinations(self):
+    @pytest.mark.parametrize("user_scopes,required_scope,should_pass", _SCOPE_COMBOS, ids=_scope_id)
+    def test_scope_combinations(self, user_scopes, required_scope, should_pass):
         """Should handle various scope combinations correctly."""
-        scope_combinations = [
-            (["read"], "read", True),
-            (["read"], "write", False),
-            (["read", "write"], "read", True),
-            (["read", "write"], "write", True),
-            (["read", "write"], "delete", False),
-            (["read", "write", "delete"], "delete", True),
-            ([], "read", False),
-        ]
-
-        for user_scopes, required_scope, should_pass in scope_combinations:
-            def test_in_context():
-                authenticated_scopes.set(user_scopes)
-                return check_required_scope(required_scope)
-
-            ctx = copy_context()
-            result = ctx.run(test_in_context)
-
-            assert result == should_pass, f"Failed for scopes {user_scopes}, required {required_scope}"
+        token = authenticated_scopes.set(user_scopes)
+        try:
+            assert check_required_scope(required_scope) is should_pass
+        finally:
+            authenticated_scopes.reset(token)
@@ -1,6 +1,7 @@
 """Unit tests for Pydantic model validation."""
 
 import pytest
+import time_machine
 from datetime import datetime, timezone, timedelta
 from uuid import UUID
 from pydantic import ValidationError
@@ -15,13 +16,47 @@ from app.models.api_key import (
 )
 from app.models.auth import AuthRequest, EmailCheckRequest
 
+# Fixed IDs for models that only need some UUID
+_UID_A = UUID("12345678-1234-5678-1234-567812345678")
+_UID_B = UUID("87654321-4321-8765-4321-876543218765")
+
+# Fixed timestamp for models that only need some UTC-aware datetime
+_NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+_FUTURE = _NOW + timedelta(days=30)
+_PAST = _NOW - timedelta(days=1)
+
+# Strings one character past each field's max_length
+_LONG_CONTENT = "a" * 100001
+_LONG_TITLE = "a" * 201
+_LONG_NAME = "a" * 101
+
+# Minimal valid JSON payloads
+_MINIMAL_ARTIFACT_JSON = b'{"content": "Test content"}'
+_MINIMAL_API_KEY_JSON = b'{"name": "Test Key"}'
+_AUTH_REQUEST_JSON = b'{"email": "test@example.com", "password": "password123"}'
+
+
+@pytest.fixture(scope="session")
+def sample_artifact():
+    """Complete artifact shared by read-only tests, validated once per session."""
+    return Artifact(
+        id=_UID_A,
+        user_id=_UID_B,
+        title="Test",
+        content="Content",
+        metadata={},
+        created_at=_NOW,
+        updated_at=_NOW,
+        version=1
+    )
+
 
 class TestArtifactModels:
     """Test suite for artifact models."""
     
     def test_artifact_create_minimal(self):
         """Should create artifact with minimal required fields."""
-        artifact = ArtifactCreate(content="Test content")
+        artifact = ArtifactCreate.model_validate_json(_MINIMAL_ARTIFACT_JSON)
         assert artifact.content == "Test content"
         assert artifact.title is None
         assert artifact.metadata == {}
@@ -36,36 +71,33 @@ class TestArtifactModels:
         assert artifact.title == "Test Title"
         assert artifact.content == "Test content"
         assert artifact.metadata == {"key": "value"}
+        assert ArtifactCreate.model_validate_json(artifact.model_dump_json()) == artifact
     
     def test_artifact_create_content_required(self):
         """Should fail when content is missing."""
         with pytest.raises(ValidationError) as exc_info:
-            ArtifactCreate()
-        errors = exc_info.value.errors()
-        assert any(e["loc"] == ("content",) for e in errors)
+            ArtifactCreate.model_validate({})
+        error = exc_info.value.errors(include_url=False, include_context=False)[0]
+        assert error["type"] == "missing"
+        assert error["loc"] == ("content",)
     
-    def test_artifact_create_empty_content_invalid(self):
+    @pytest.mark.parametrize("model", [ArtifactCreate, ArtifactUpdate], ids=["create", "update"])
+    def test_artifact_empty_content_invalid(self, model):
         """Should fail with empty content."""
-        with pytest.raises(ValidationError) as exc_info:
-            ArtifactCreate(content="")
-        errors = exc_info.value.errors()
-        assert any("at least 1 character" in str(e) for e in errors)
+        with pytest.raises(ValidationError, match="at least 1 character"):
+            model.model_validate({"content": ""})
     
-    def test_artifact_create_content_max_length(self):
+    @pytest.mark.parametrize("model", [ArtifactCreate, ArtifactUpdate], ids=["create", "update"])
+    def test_artifact_content_max_length(self, model):
         """Should fail when content exceeds 100k characters."""
-        long_content = "a" * 100001
-        with pytest.raises(ValidationError) as exc_info:
-            ArtifactCreate(content=long_content)
-        errors = exc_info.value.errors()
-        assert any("at most 100000 characters" in str(e) for e in errors)
+        with pytest.raises(ValidationError, match="at most 100000 characters"):
+            model.model_validate({"content": _LONG_CONTENT})
     
-    def test_artifact_create_title_max_length(self):
+    @pytest.mark.parametrize("model", [ArtifactCreate, ArtifactUpdate], ids=["create", "update"])
+    def test_artifact_title_max_length(self, model):
         """Should fail when title exceeds 200 characters."""
-        long_title = "a" * 201
-        with pytest.raises(ValidationError) as exc_info:
-            ArtifactCreate(title=long_title, content="test")
-        errors = exc_info.value.errors()
-        assert any("at most 200 characters" in str(e) for e in errors)
+        with pytest.raises(ValidationError, match="at most 200 characters"):
+            model.model_validate({"title": _LONG_TITLE, "content": "test"})
     
     def test_artifact_update_all_optional(self):
         """Should allow all fields to be optional in update."""
@@ -80,21 +112,11 @@ class TestArtifactModels:
         assert update.title == "New Title"
         assert update.content is None
     
-    def test_artifact_complete_model(self):
+    def test_artifact_complete_model(self, sample_artifact):
         """Should create complete artifact with system fields."""
-        artifact = Artifact(
-            id=UUID("12345678-1234-5678-1234-567812345678"),
-            user_id=UUID("87654321-4321-8765-4321-876543218765"),
-            title="Test",
-            content="Content",
-            metadata={},
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc),
-            version=1
-        )
-        assert artifact.id
-        assert artifact.user_id
-        assert artifact.version == 1
+        assert sample_artifact.id
+        assert sample_artifact.user_id
+        assert sample_artifact.version == 1
 
 
 class TestApiKeyModels:
@@ -102,7 +124,7 @@ class TestApiKeyModels:
     
     def test_api_key_create_minimal(self):
         """Should create API key with minimal fields."""
-        api_key = ApiKeyCreate(name="Test Key")
+        api_key = ApiKeyCreate.model_validate_json(_MINIMAL_API_KEY_JSON)
         assert api_key.name == "Test Key"
         assert api_key.expires_at is None
         assert api_key.scopes == [ApiKeyScope.READ, ApiKeyScope.WRITE]
@@ -115,44 +137,38 @@ class TestApiKeyModels:
         )
         assert api_key.scopes == [ApiKeyScope.READ]
     
+    @time_machine.travel(_NOW, tick=False)
     def test_api_key_create_with_expiry(self):
         """Should create API key with expiry date."""
-        future_date = datetime.now(timezone.utc) + timedelta(days=30)
         api_key = ApiKeyCreate(
             name="Test Key",
-            expires_at=future_date
+            expires_at=_FUTURE
         )
-        assert api_key.expires_at == future_date
+        assert api_key.expires_at == _FUTURE
     
+    @time_machine.travel(_NOW, tick=False)
     def test_api_key_create_past_expiry_invalid(self):
         """Should fail with past expiry date."""
-        past_date = datetime.now(timezone.utc) - timedelta(days=1)
-        with pytest.raises(ValidationError) as exc_info:
-            ApiKeyCreate(name="Test Key", expires_at=past_date)
-        errors = exc_info.value.errors()
-        assert any("future" in str(e).lower() for e in errors)
+        with pytest.raises(ValidationError, match="must be in the future"):
+            ApiKeyCreate.model_validate({"name": "Test Key", "expires_at": _PAST})
     
     def test_api_key_create_name_required(self):
         """Should fail when name is missing."""
         with pytest.raises(ValidationError) as exc_info:
-            ApiKeyCreate()
-        errors = exc_info.value.errors()
-        assert any(e["loc"] == ("name",) for e in errors)
+            ApiKeyCreate.model_validate({})
+        error = exc_info.value.errors(include_url=False, include_context=False)[0]
+        assert error["type"] == "missing"
+        assert error["loc"] == ("name",)
     
     def test_api_key_create_name_min_length(self):
         """Should fail with empty name."""
-        with pytest.raises(ValidationError) as exc_info:
-            ApiKeyCreate(name="")
-        errors = exc_info.value.errors()
-        assert any("at least 1 character" in str(e) for e in errors)
+        with pytest.raises(ValidationError, match="at least 1 character"):
+            ApiKeyCreate.model_validate({"name": ""})
     
     def test_api_key_create_name_max_length(self):
         """Should fail when name exceeds 100 characters."""
-        long_name = "a" * 101
-        with pytest.raises(ValidationError) as exc_info:
-            ApiKeyCreate(name=long_name)
-        errors = exc_info.value.errors()
-        assert any("at most 100 characters" in str(e) for e in errors)
+        with pytest.raises(ValidationError, match="at most 100 characters"):
+            ApiKeyCreate.model_validate({"name": _LONG_NAME})
     
     def test_api_key_update_all_optional(self):
         """Should allow all fields to be optional in update."""
@@ -173,26 +189,22 @@ class TestAuthModels:
     
     def test_auth_request_valid_email(self):
         """Should create auth request with valid email."""
-        auth = AuthRequest(
-            email="test@example.com",
-            password="password123"
-        )
+        auth = AuthRequest.model_validate_json(_AUTH_REQUEST_JSON)
         assert auth.email == "test@example.com"
         assert auth.password == "password123"
     
     def test_auth_request_invalid_email(self):
         """Should fail with invalid email format."""
-        with pytest.raises(ValidationError) as exc_info:
-            AuthRequest(email="not-an-email", password="password123")
-        errors = exc_info.value.errors()
-        assert any("email" in str(e).lower() for e in errors)
+        with pytest.raises(ValidationError, match="not a valid email address"):
+            AuthRequest.model_validate({"email": "not-an-email", "password": "password123"})
     
     def test_auth_request_missing_fields(self):
         """Should fail when required fields are missing."""
         with pytest.raises(ValidationError) as exc_info:
-            AuthRequest(email="test@example.com")
-        errors = exc_info.value.errors()
-        assert any(e["loc"] == ("password",) for e in errors)
+            AuthRequest.model_validate({"email": "test@example.com"})
+        error = exc_info.value.errors(include_url=False, include_context=False)[0]
+        assert error["type"] == "missing"
+        assert error["loc"] == ("password",)
     
     def test_email_check_request(self):
         """Should validate email format in check request."""
@@ -200,7 +212,7 @@ class TestAuthModels:
         assert check.email == "test@example.com"
         
         with pytest.raises(ValidationError):
-            EmailCheckRequest(email="invalid")
+            EmailCheckRequest.model_validate({"email": "invalid"})
 
 
 class TestArtifactVersionModels:
@@ -213,7 +225,7 @@ class TestArtifactVersionModels:
             title="Test",
             content="Content",
             metadata={},
-            updated_at=datetime.now(timezone.utc),
+            updated_at=_NOW,
             content_length=7
         )
         assert version.version == 1
@@ -227,7 +239,7 @@ class TestArtifactVersionModels:
             title="Updated",
             content="New content",
             metadata={"key": "value"},
-            updated_at=datetime.now(timezone.utc),
+            updated_at=_NOW,
             content_length=11,
             title_changed=True,
             content_changed=True
@@ -240,7 +252,7 @@ class TestArtifactVersionModels:
         summary = ArtifactVersionSummary(
             version=1,
             title="Test",
-            updated_at=datetime.now(timezone.utc),
+            updated_at=_NOW,
             content_length=100
         )
         assert summary.version == 1
@@ -251,7 +263,7 @@ class TestArtifactVersionModels:
         summary = ArtifactVersionSummary(
             version=2,
             title="Updated",
-            updated_at=datetime.now(timezone.utc),
+            updated_at=_NOW,
             content_length=150,
             changes=["title", "content"]
         )
@@ -259,21 +271,20 @@ class TestArtifactVersionModels:
 
     def test_artifact_versions_response(self):
         """Should create versions response."""
-        test_id = UUID("12345678-1234-5678-1234-567812345678")
         response = ArtifactVersionsResponse(
-            id=test_id,
+            id=_UID_A,
             current_version=2,
             version_count=2,
             versions=[
                 ArtifactVersionSummary(
                     version=1,
                     title="Original",
-                    updated_at=datetime.now(timezone.utc),
+                    updated_at=_NOW,
                     content_length=100
                 )
             ]
         )
-        assert response.id == test_id
+        assert response.id == _UID_A
         assert response.current_version == 2
         assert len(response.versions) == 1
 
@@ -305,28 +316,26 @@ class TestArtifactListModels:
 
     def test_artifact_search_result(self):
         """Should create search result."""
-        test_id = UUID("12345678-1234-5678-1234-567812345678")
         result = ArtifactSearchResult(
-            id=test_id,
+            id=_UID_A,
             title="Search Result",
             snippet="This is a snippet...",
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
+            created_at=_NOW,
+            updated_at=_NOW
         )
-        assert result.id == test_id
+        assert result.id == _UID_A
         assert result.snippet == "This is a snippet..."
         assert result.metadata == {}
 
     def test_artifact_search_result_with_metadata(self):
         """Should create search result with metadata."""
-        test_id = UUID("12345678-1234-5678-1234-567812345678")
         result = ArtifactSearchResult(
-            id=test_id,
+            id=_UID_A,
             title="Search Result",
             snippet="Snippet",
             metadata={"category": "test"},
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
+            created_at=_NOW,
+            updated_at=_NOW
         )
         assert result.metadata == {"category": "test"}
 
@@ -336,41 +345,39 @@ class TestApiKeyResponseModels:
 
     def test_api_key_response(self):
         """Should create API key response without sensitive data."""
-        test_id = UUID("12345678-1234-5678-1234-567812345678")
-        test_user_id = UUID("87654321-4321-8765-4321-876543218765")
         response = ApiKeyResponse(
-            id=test_id,
-            user_id=test_user_id,
+            id=_UID_A,
+            user_id=_UID_B,
             name="Test Key",
             key_prefix="sk_prod_",
             last_4="abcd",
-            scopes=["read", "write"],
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
+            scopes=[ApiKeyScope.READ, ApiKeyScope.WRITE],
+            created_at=_NOW,
+            updated_at=_NOW
         )
         assert response.name == "Test Key"
         assert response.key_prefix == "sk_prod_"
         assert response.last_4 == "abcd"
         assert response.is_active is True
         assert response.last_used_at is None
+        assert ApiKeyResponse.model_validate_json(response.model_dump_json()) == response
 
     def test_api_key_created_with_key(self):
         """Should create API key creation response with actual key."""
-        test_id = UUID("12345678-1234-5678-1234-567812345678")
-        test_user_id = UUID("87654321-4321-8765-4321-876543218765")
         response = ApiKeyCreated(
-            id=test_id,
-            user_id=test_user_id,
+            id=_UID_A,
+            user_id=_UID_B,
             name="Test Key",
             key_prefix="sk_prod_",
             last_4="abcd",
             api_key="sk_prod_1234567890abcdefghijklmnopqrstuvwxyz",
-            scopes=["read", "write"],
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
+            scopes=[ApiKeyScope.READ, ApiKeyScope.WRITE],
+            created_at=_NOW,
+            updated_at=_NOW
         )
         assert response.api_key == "sk_prod_1234567890abcdefghijklmnopqrstuvwxyz"
         assert response.name == "Test Key"
+        assert ApiKeyCreated.model_validate_json(response.model_dump_json()) == response
 
     def test_api_key_list(self):
         """Should create API key list response."""
@@ -383,16 +390,14 @@ class TestApiKeyResponseModels:
 
     def test_api_key_validation_valid(self):
         """Should create valid API key validation result."""
-        test_user_id = UUID("12345678-1234-5678-1234-567812345678")
-        test_key_id = UUID("87654321-4321-8765-4321-876543218765")
         validation = ApiKeyValidation(
             is_valid=True,
-            user_id=test_user_id,
+            user_id=_UID_A,
             scopes=["read", "write"],
-            key_id=test_key_id
+            key_id=_UID_B
         )
         assert validation.is_valid is True
-        assert validation.user_id == test_user_id
+        assert validation.user_id == _UID_A
         assert validation.error_message is None
 
     def test_api_key_validation_invalid(self):
@@ -3,103 +3,61 @@
 import pytest
 from app.utils.markdown import extract_title_from_content
 
+# Repeated-character inputs shared across cases
+_A100 = "A" * 100
+_A200 = "A" * 200
+_A250 = "A" * 250
+
 
 class TestExtractTitleFromContent:
     """Test suite for extract_title_from_content function."""
-    
-    def test_extract_h1_heading(self):
-        """Should extract H1 heading as title."""
-        content = "# Main Title\n\nSome content here"
-        assert extract_title_from_content(content) == "Main Title"
-    
-    def test_extract_h1_with_extra_spaces(self):
-        """Should handle extra spaces in H1."""
-        content = "#   Spaced Title   \n\nContent"
-        assert extract_title_from_content(content) == "Spaced Title"
-    
-    def test_extract_h2_when_no_h1(self):
-        """Should fall back to H2 when no H1 exists."""
-        content = "Some text\n## Secondary Title\nMore content"
-        assert extract_title_from_content(content) == "Secondary Title"
-    
-    def test_extract_first_line_when_no_headings(self):
-        """Should use first non-empty line when no headings."""
-        content = "This is the first line\nThis is the second line"
-        assert extract_title_from_content(content) == "This is the first line"
-    
-    def test_skip_empty_lines(self):
-        """Should skip empty lines to find first content."""
-        content = "\n\n\nFirst real line\nSecond line"
-        assert extract_title_from_content(content) == "First real line"
-    
-    def test_empty_content(self):
-        """Should return 'Untitled' for empty content."""
-        assert extract_title_from_content("") == "Untitled"
-        assert extract_title_from_content(None) == "Untitled"
-    
-    def test_whitespace_only_content(self):
-        """Should handle whitespace-only content."""
-        content = "   \n\n\t\t  \n   "
+
+    @pytest.mark.parametrize("content,max_length,expected", [
+        ("# Main Title\n\nSome content here", 200, "Main Title"),
+        ("#   Spaced Title   \n\nContent", 200, "Spaced Title"),
+        ("Some text\n## Secondary Title\nMore content", 200, "Secondary Title"),
+        ("This is the first line\nThis is the second line", 200, "This is the first line"),
+        ("\n\n\nFirst real line\nSecond line", 200, "First real line"),
+        ("", 200, "Untitled"),
+        (None, 200, "Untitled"),
         # Whitespace gets stripped, returns empty string
-        assert extract_title_from_content(content) == ""
-    
-    def test_max_length_truncation(self):
-        """Should truncate long titles to max_length."""
-        long_title = "A" * 250
-        content = f"# {long_title}\n\nContent"
-        result = extract_title_from_content(content, max_length=200)
-        assert len(result) == 200
-        assert result == "A" * 200
-    
-    def test_custom_max_length(self):
-        """Should respect custom max_length parameter."""
-        content = "# Short Title\n\nContent"
-        result = extract_title_from_content(content, max_length=5)
-        assert result == "Short"
-    
-    def test_fallback_truncation_for_long_content(self):
-        """Should truncate long content when no title found."""
-        content = "A" * 100  # No headings, just long text
-        result = extract_title_from_content(content)
+        ("   \n\n\t\t  \n   ", 200, ""),
+        (f"# {_A250}\n\nContent", 200, _A200),
+        ("# Short Title\n\nContent", 5, "Short"),
         # First line is used, not truncated fallback
-        assert result == "A" * 100
-    
-    def test_multiline_heading_extraction(self):
-        """Should handle headings in middle of content."""
-        content = """Some preamble text
-that spans multiple lines
-
-# Actual Title Here
-
-And then more content"""
-        assert extract_title_from_content(content) == "Actual Title Here"
-    
-    def test_markdown_formatting_in_title(self):
-        """Should preserve markdown formatting in title."""
-        content = "# Title with **bold** and *italic*\n\nContent"
-        assert extract_title_from_content(content) == "Title with **bold** and *italic*"
-    
-    def test_h1_priority_over_h2(self):
-        """Should prioritize H1 over H2 even if H2 comes first."""
-        content = """## Second Level
-        
-# First Level
-
-Content here"""
-        assert extract_title_from_content(content) == "First Level"
-    
-    def test_special_characters_in_title(self):
-        """Should handle special characters in title."""
-        content = "# Title with @#$%^&*() symbols!\n\nContent"
-        assert extract_title_from_content(content) == "Title with @#$%^&*() symbols!"
-    
-    def test_code_block_not_treated_as_heading(self):
-        """Should not extract headings from code blocks."""
-        content = """```python
-# This is a comment, not a heading
-print("hello")
-```
-
-First actual line"""
+        (_A100, 200, _A100),
+        (
+            "Some preamble text\nthat spans multiple lines\n\n# Actual Title Here\n\nAnd then more content",
+            200,
+            "Actual Title Here"
+        ),
+        ("# Title with **bold** and *italic*\n\nContent", 200, "Title with **bold** and *italic*"),
+        ("## Second Level\n        \n# First Level\n\nContent here", 200, "First Level"),
+        ("# Title with @#$%^&*() symbols!\n\nContent", 200, "Title with @#$%^&*() symbols!"),
         # The regex finds the # comment line unfortunately
-        assert extract_title_from_content(content) == "This is a comment, not a heading"
+        (
+            "```python\n# This is a comment, not a heading\nprint(\"hello\")\n```\n\nFirst actual line",
+            200,
+            "This is a comment, not a heading"
+        ),
+    ], ids=[
+        "h1_heading",
+        "h1_with_extra_spaces",
+        "h2_when_no_h1",
+        "first_line_when_no_headings",
+        "skip_empty_lines",
+        "empty_content",
+        "none_content",
+        "whitespace_only_content",
+        "max_length_truncation",
+        "custom_max_length",
+        "long_first_line_not_truncated",
+        "heading_in_middle_of_content",
+        "markdown_formatting_in_title",
+        "h1_priority_over_h2",
+        "special_characters_in_title",
+        "code_block_comment_treated_as_heading",
+    ])
+    def test_extract_title(self, content, max_length, expected):
+        """Should extract the expected title from content."""
+        assert extract_title_from_content(content, max_length) == expected
@@ -1,87 +1,77 @@
 """Unit tests for text utility functions."""
 
 import pytest
-from app.utils.text import generate_snippet
+from app.utils.text import generate_snippet, content_hash
 
+# Repeated-character inputs shared across cases
+_A200 = "A" * 200
+_A201 = "A" * 201
+_A250 = "A" * 250
 
-class TestGenerateSnippet:
-    """Test suite for generate_snippet function."""
-
-    def test_empty_content(self):
-        """Should return empty string for empty content."""
-        assert generate_snippet("") == ""
-        assert generate_snippet(None) == ""
-
-    def test_short_content_no_truncation(self):
-        """Should return full content when under max_length."""
-        content = "Short content"
-        assert generate_snippet(content) == "Short content"
-
-        content = "A" * 200  # Exactly at limit
-        assert generate_snippet(content) == "A" * 200
-
-    def test_long_content_truncation(self):
-        """Should truncate and add ellipsis when over max_length."""
-        content = "A" * 250
-        result = generate_snippet(content)
-        assert len(result) == 203  # 200 chars + "..."
-        assert result == "A" * 200 + "..."
-
-    def test_exact_boundary(self):
-        """Should handle content at exact boundary."""
-        content = "A" * 200
-        assert generate_snippet(content) == "A" * 200  # No ellipsis
+# Mixed-width unicode text, well past the default snippet length
+_UNICODE_LONG = "Hello 世界 🌍 " * 50
 
-        content = "A" * 201
-        assert generate_snippet(content) == "A" * 200 + "..."  # With ellipsis
 
-    def test_custom_max_length(self):
-        """Should respect custom max_length parameter."""
-        content = "Hello World!"
-        assert generate_snippet(content, max_length=5) == "Hello..."
-
-        content = "Hello World!"
-        assert generate_snippet(content, max_length=6) == "Hello ..."
-
-    def test_whitespace_handling(self):
-        """Should strip whitespace from content."""
-        content = "  \n\n  Content with spaces  \n\n  "
-        assert generate_snippet(content) == "Content with spaces"
-
-        # All whitespace
-        content = "   \n\n\t\t  \n   "
-        assert generate_snippet(content) == ""
+class TestGenerateSnippet:
+    """Test suite for generate_snippet function."""
 
-    def test_multiline_content(self):
-        """Should handle multiline content correctly."""
-        content = """Line 1
-Line 2
-Line 3
-Line 4"""
-        result = generate_snippet(content, max_length=15)
-        assert result == "Line 1\nLine 2\nL..."
+    @pytest.mark.parametrize("content,max_length,expected", [
+        ("", 200, ""),
+        (None, 200, ""),
+        ("Short content", 200, "Short content"),
+        (_A200, 200, _A200),
+        (_A250, 200, _A200 + "..."),
+        (_A201, 200, _A200 + "..."),
+        ("Hello World!", 5, "Hello..."),
+        ("Hello World!", 6, "Hello ..."),
+        ("  \n\n  Content with spaces  \n\n  ", 200, "Content with spaces"),
+        ("   \n\n\t\t  \n   ", 200, ""),
+        ("Line 1\nLine 2\nLine 3\nLine 4", 15, "Line 1\nLine 2\nL..."),
+        ("# Title\n\n**Bold** and *italic* text with `code`", 30, "# Title\n\n**Bold** and *italic*..."),
+        ("Hello", 1, "H..."),
+        ("Hello", 0, "..."),
+        ("Word1    Word2\n\nWord3", 50, "Word1    Word2\n\nWord3"),
+    ], ids=[
+        "empty_content",
+        "none_content",
+        "short_content_no_truncation",
+        "exactly_at_limit",
+        "long_content_truncation",
+        "one_over_limit",
+        "custom_max_length",
+        "custom_max_length_keeps_trailing_space",
+        "strips_whitespace",
+        "whitespace_only",
+        "multiline_content",
+        "markdown_not_stripped",
+        "max_length_one",
+        "max_length_zero",
+        "preserves_internal_whitespace",
+    ])
+    def test_generate_snippet(self, content, max_length, expected):
+        """Should produce the expected snippet for the content."""
+        assert generate_snippet(content, max_length) == expected
 
     def test_unicode_content(self):
         """Should handle unicode characters."""
-        content = "Hello 世界 🌍 " * 50
-        result = generate_snippet(content)
+        result = generate_snippet(_UNICODE_LONG)
         assert len(result) == 203  # 200 + "..."
         assert result.endswith("...")
 
-    def test_markdown_content(self):
-        """Should not strip markdown formatting."""
-        content = "# Title\n\n**Bold** and *italic* text with `code`"
-        result = generate_snippet(content, max_length=30)
-        assert result == "# Title\n\n**Bold** and *italic*..."
 
-    def test_very_small_max_length(self):
-        """Should handle very small max_length values."""
-        content = "Hello"
-        assert generate_snippet(content, max_length=1) == "H..."
-        assert generate_snippet(content, max_length=0) == "..."
+class TestContentHash:
+    """Test suite for content_hash function."""
+
+    def test_deterministic(self):
+        """Should return the same hash for the same content."""
+        assert content_hash("Same content") == content_hash("Same content")
+
+    def test_different_content(self):
+        """Should return different hashes for different content."""
+        assert content_hash("Content A") != content_hash("Content B")
 
-    def test_preserves_internal_whitespace(self):
-        """Should preserve whitespace within content."""
-        content = "Word1    Word2\n\nWord3"
-        result = generate_snippet(content, max_length=50)
-        assert result == "Word1    Word2\n\nWord3"
+    def test_fits_bigint(self):
+        """Should fit in a signed 64-bit Postgres BIGINT."""
+        for content in ["", "Hello", "Hello 世界 🌍" * 100]:
+            value = content_hash(content)
+            assert -(2 ** 63) <= value < 2 ** 63